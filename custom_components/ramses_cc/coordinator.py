@@ -139,6 +139,10 @@ _DEVICE_ID_RE: Final[re.Pattern[str]] = re.compile(r"^[0-9A-F]{2}:[0-9A-F]{6}$",
 _EXTRACT_DEVICE_ID_RE: Final[re.Pattern[str]] = re.compile(
     r"[0-9A-F]{2}:[0-9A-F]{6}", re.I
 )
+# Codes not restored from the packet cache (see _get_saved_packets)
+_CACHED_PKT_CODE_FILTER: Final[frozenset[str]] = frozenset({"313F"})
+# PacketDTO keys that may hold a device address (see _get_saved_packets)
+_PKT_ADDR_KEYS: Final[tuple[str, ...]] = ("addr1", "addr2", "addr3", "src", "dst")
 
 
 @lru_cache(maxsize=128)
@@ -264,16 +268,22 @@ class RamsesCoordinator(DataUpdateCoordinator):
         Extracts device IDs dynamically to enforce the known list, ensuring
         compatibility with varying packet string formats and JSON DTOs.
         """
-        msg_code_filter = ["313F"]
         # Phase 4: known_list is derived from schema, no longer stored in
         # config entry options.  Use the schema-derived known_list for
         # packet filtering.
         config_schema = self.options.get(CONF_SCHEMA, {})
         known_list = self._derive_known_list_from_schema(config_schema)
+        # Built once: a set-level isdisjoint() per packet, not a Python-level any()
+        known_ids = frozenset(known_list)
         enforce_known_list = True  # Phase 4: always-on
 
+        # With nothing in the known list every packet would be discarded
+        # (e.g. a fresh start with an empty schema), so skip the scan
+        if enforce_known_list and not known_ids:
+            return {}
+
         packets: dict[str, dict[str, Any] | str] = {}
-        now = dt_util.now()
+        cutoff = dt_util.now() - td(days=1)
 
         # Iterate over packets from storage
         for dtm, pkt in client_state.get(SZ_PACKETS, {}).items():
@@ -288,13 +298,13 @@ class RamsesCoordinator(DataUpdateCoordinator):
                 continue
 
             # 1. Check age (keep last 24 hours)
-            if dt_obj <= now - td(days=1):
+            if dt_obj <= cutoff:
                 continue
 
             # Handle new PacketDTO dictionary format natively
             if isinstance(pkt, dict):
                 # 2. Filter out unwanted message codes
-                if pkt.get("code") in msg_code_filter:
+                if pkt.get("code") in _CACHED_PKT_CODE_FILTER:
                     continue
 
                 # 3. Enforce known list dynamically
@@ -305,7 +315,7 @@ class RamsesCoordinator(DataUpdateCoordinator):
                     # provides for known_list enforcement (PR 782).
                     # Fall back to logical src/dst for ramses_rf versions
                     # that only have PR 780 (no addr1/2/3 keys yet).
-                    for key in ("addr1", "addr2", "addr3", "src", "dst"):
+                    for key in _PKT_ADDR_KEYS:
                         addr = pkt.get(key)
                         if not addr:
                             continue
@@ -322,14 +332,14 @@ class RamsesCoordinator(DataUpdateCoordinator):
                             found_devices.append(addr)
 
                     # If the packet contains no devices from our known_list, discard it
-                    if not any(dev in known_list for dev in found_devices):
+                    if known_ids.isdisjoint(found_devices):
                         continue
 
             # Fallback for users migrating from legacy string-based caches
             else:
                 # 2. Filter out unwanted message codes
                 # Using string containment is safer against format changes than pkt[41:45]
-                if any(f" {code} " in pkt for code in msg_code_filter):
+                if any(f" {code} " in pkt for code in _CACHED_PKT_CODE_FILTER):
                     continue
 
                 # 3. Enforce known list dynamically
@@ -338,7 +348,7 @@ class RamsesCoordinator(DataUpdateCoordinator):
                     found_devices = _EXTRACT_DEVICE_ID_RE.findall(pkt)
 
                     # If the packet contains no devices from our known_list, discard it
-                    if not any(dev in known_list for dev in found_devices):
+                    if known_ids.isdisjoint(found_devices):
                         continue
 
             packets[dtm] = pkt
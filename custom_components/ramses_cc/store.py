@@ -6,6 +6,7 @@ import contextlib
 import logging
 import os
 import time
+from copy import deepcopy
 from typing import Any, Final
 
 import yaml  # type: ignore[import-untyped, unused-ignore]
@@ -82,8 +83,14 @@ class RamsesStore:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the storage helper."""
         self._hass = hass
+        # The packet cache can run to megabytes of JSON, so it is encoded in
+        # the executor rather than on the event loop (see async_save)
         self._store = RamsesCcStore(
-            hass, STORAGE_VERSION, STORAGE_KEY, max_readable_version=2
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY,
+            max_readable_version=2,
+            serialize_in_event_loop=False,
         )
 
     async def async_load(self) -> dict[str, Any]:
@@ -109,6 +116,16 @@ class RamsesStore:
 
         If ``hvac_schema`` is None, any existing HVAC schema is preserved.
 
+        The data is encoded in the executor, so it is snapshotted first: the
+        schema, remotes and discovery state are deep-copied, as they may still
+        be referenced (and mutated) by live objects. Each packet dict is only
+        copied shallowly; its payload is parser output that is never mutated,
+        and deep-copying thousands of packets would cost more than encoding.
+
+        A save that would write exactly what is already stored (e.g. the
+        periodic save of an idle system) is skipped: comparing the dicts is
+        far cheaper than encoding and writing the file again.
+
         :param schema: The current device schema
         :param packets: The cached packet log (supports legacy strings and JSON DTOs)
         :param remotes: The known remotes and their commands
@@ -116,12 +133,18 @@ class RamsesStore:
         :param hvac_schema: HVAC-only schema entries (load_fan stub workaround)
         """
         data: dict[str, Any] = {
-            SZ_CLIENT_STATE: {SZ_SCHEMA: schema, SZ_PACKETS: packets},
-            SZ_REMOTES: remotes,
+            SZ_CLIENT_STATE: {
+                SZ_SCHEMA: deepcopy(schema),
+                SZ_PACKETS: {
+                    dtm: dict(pkt) if isinstance(pkt, dict) else pkt
+                    for dtm, pkt in packets.items()
+                },
+            },
+            SZ_REMOTES: deepcopy(remotes),
         }
 
         if discovery is not None:
-            data[SZ_DISCOVERY] = discovery
+            data[SZ_DISCOVERY] = deepcopy(discovery)
         else:
             # Preserve existing discovery state if we don't have new data
             existing = await self._store.async_load()
@@ -129,7 +152,7 @@ class RamsesStore:
                 data[SZ_DISCOVERY] = existing[SZ_DISCOVERY]
 
         if hvac_schema is not None:
-            data[SZ_HVAC_SCHEMA] = hvac_schema
+            data[SZ_HVAC_SCHEMA] = deepcopy(hvac_schema)
         else:
             # Preserve existing HVAC schema if we don't have new data
             existing = await self._store.async_load() or {}
@@ -141,6 +164,10 @@ class RamsesStore:
         if _BACKUP_KEY in existing:
             data[_BACKUP_KEY] = existing[_BACKUP_KEY]
 
+        if data == existing:
+            _LOGGER.debug("Client state unchanged since the last save, skipping")
+            return
+
         await self._store.async_save(data)
 
     async def async_save_backup(
@@ -0,0 +1,34 @@
+"""Fixtures shared by all the ramses_cc test suites."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+
+import ramses_tx
+
+
+@pytest.fixture(autouse=True, scope="session")
+def packet_log_in_tmp_path(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Generator[None]:
+    """Write the packet logs of the tests to a temporary directory.
+
+    ramses_tx writes them relative to the working directory by default, which
+    would leave ``packet_log.log`` (and its rotations) in the repo checkout.
+
+    :param tmp_path_factory: The pytest session-scoped temporary path factory.
+    :yield: None.
+    """
+    log_dir = tmp_path_factory.mktemp("packet_log")
+    set_pkt_logging = ramses_tx.set_pkt_logging
+
+    def _set_pkt_logging(logger: Any, **config: Any) -> Any:
+        config["packet_log_path"] = str(log_dir / (config.get("packet_log_path") or ""))
+        return set_pkt_logging(logger, **config)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ramses_tx, "set_pkt_logging", _set_pkt_logging)
+        yield
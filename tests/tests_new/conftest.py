@@ -5,7 +5,7 @@ from __future__ import annotations
 import contextlib
 from collections.abc import AsyncGenerator, Generator
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from homeassistant.core import HomeAssistant
@@ -20,16 +20,41 @@ except (ImportError, ModuleNotFoundError):
     VirtualRf = None  # Windows: pty/termios unavailable
 
 
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the custom markers used by these tests.
+
+    :param config: The pytest config object.
+    """
+    config.addinivalue_line(
+        "markers", "no_hass: the test does not need a Home Assistant instance"
+    )
+
+
 @pytest.fixture(autouse=True)
-def auto_enable_custom_integrations(
-    enable_custom_integrations: Any,
-) -> Generator[None]:
+def auto_enable_custom_integrations(request: pytest.FixtureRequest) -> None:
     """Automatically enable custom integrations for all tests.
 
-    :param enable_custom_integrations: The fixture to enable.
-    :yield: None.
+    Enabling them needs a ``hass`` instance, so tests marked ``no_hass`` (which
+    never touch HA) skip it rather than paying for an instance per test.
+
+    :param request: The pytest request for the test being set up.
+    """
+    if request.node.get_closest_marker("no_hass") is None:
+        request.getfixturevalue("enable_custom_integrations")
+
+
+@pytest.fixture
+def mock_dr(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Point ``device_registry.async_get`` at a MagicMock device registry.
+
+    :param monkeypatch: The pytest monkeypatch fixture.
+    :return: The MagicMock returned by ``device_registry.async_get``.
     """
-    yield
+    dr_mock = MagicMock()
+    monkeypatch.setattr(
+        "homeassistant.helpers.device_registry.async_get", lambda hass: dr_mock
+    )
+    return dr_mock
 
 
 # NOTE: ? workaround for: https://github.com/MatthewFlamm/pytest-homeassistant-custom-component/issues/198
@@ -5,6 +5,7 @@ options menu (OptionsFlow).
 """
 
 import copy
+import logging
 from collections.abc import Callable, Iterator
 from datetime import timedelta as td
 from importlib.metadata import version
@@ -1036,7 +1037,7 @@ async def test_configure_serial_port_validation_error(
 
 
 async def test_configure_serial_port_missing_port_name(
-    hass: HomeAssistant,
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
     """Test that the flow handles a missing port_name in options correctly."""
     result = await hass.config_entries.flow.async_init(
@@ -1069,9 +1070,7 @@ async def test_configure_serial_port_missing_port_name(
     current_step["data_schema"] = new_schema
 
     # 4. Submit without port_name to trigger the 'else' branch (line 321)
-    with patch(
-        "custom_components.ramses_cc.config_flow._LOGGER.error"
-    ) as mock_log_error:
+    with caplog.at_level(logging.ERROR, logger="custom_components.ramses_cc"):
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             user_input={SZ_SERIAL_PORT: {}},
@@ -1083,7 +1082,7 @@ async def test_configure_serial_port_missing_port_name(
     errors = result.get("errors")
     assert errors is not None
     assert errors[SZ_PORT_NAME] == "port_name_required"
-    mock_log_error.assert_called_with("ERROR: port_name is None!")
+    assert any(r.getMessage() == "ERROR: port_name is None!" for r in caplog.records)
 
 
 async def test_options_flow_configure_serial_port(hass: HomeAssistant) -> None:
@@ -9,7 +9,7 @@ import sys
 from collections.abc import AsyncGenerator
 from datetime import datetime as dt, timedelta as td
 from typing import Any, cast
-from unittest.mock import ANY, AsyncMock, MagicMock, call, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 import serial  # type: ignore[import-untyped]
@@ -1200,8 +1200,7 @@ async def test_setup_packet_filtering(
 
     # Wire up mock_client to be returned by _create_client
     mock_client = MagicMock(spec=Gateway)
-    mock_start = AsyncMock()
-    cast(Any, mock_client).start = mock_start
+    mock_start = mock_client.start  # already an AsyncMock
     cast(Any, coordinator)._create_client = MagicMock(return_value=mock_client)
 
     now: dt = dt_util.now()
@@ -1244,9 +1243,6 @@ async def test_setup_packet_filtering(
     # Note: unknown_packet timestamp key is dynamic, so we check count
     assert len(packets) == 1
 
-    # Ensure the event loop has processed all mock callbacks
-    await asyncio.sleep(0)
-
 
 async def test_setup_packet_filtering_regex_resilience(
     hass: HomeAssistant, mock_entry: MagicMock
@@ -1435,7 +1431,7 @@ async def test_update_device_skips_redundant_update(
 
 
 async def test_discovery_task_handles_exception(
-    mock_coordinator: RamsesCoordinator,
+    mock_coordinator: RamsesCoordinator, caplog: pytest.LogCaptureFixture
 ) -> None:
     """Test _async_discovery_task catches and logs exceptions.
 
@@ -1447,13 +1443,13 @@ async def test_discovery_task_handles_exception(
             "_discover_new_entities",
             side_effect=Exception("Boom"),
         ),
-        patch("custom_components.ramses_cc.coordinator._LOGGER") as mock_log,
+        caplog.at_level(logging.ERROR, logger="custom_components.ramses_cc"),
     ):
         await mock_coordinator._async_discovery_task()
 
-        cast(Any, mock_log.error).assert_called_with(
-            "Discovery error: %s", ANY, exc_info=True
-        )
+    (record,) = [r for r in caplog.records if r.getMessage() == "Discovery error: Boom"]
+    assert record.levelno == logging.ERROR
+    assert record.exc_info is not None
 
 
 async def test_service_delegates(mock_coordinator: RamsesCoordinator) -> None:
@@ -3645,7 +3641,7 @@ async def test_get_saved_packets_dict_format_unknown_device(
 async def test_get_saved_packets_dict_format_filtered_code(
     hass: HomeAssistant,
 ) -> None:
-    """Test _get_saved_packets filters out packets with code in msg_code_filter."""
+    """Test _get_saved_packets filters out packets with a code in _CACHED_PKT_CODE_FILTER."""
     entry = MockConfigEntry(
         domain=DOMAIN,
         entry_id="test_dict_code",
@@ -3786,6 +3782,31 @@ async def test_get_saved_packets_src_dst_unknown_device(hass: HomeAssistant) ->
     assert recent not in result  # dropped: neither src nor dst in known_list
 
 
+async def test_get_saved_packets_empty_known_list(hass: HomeAssistant) -> None:
+    """Test _get_saved_packets discards everything without scanning it.
+
+    With an empty schema the known list is empty, so no packet can be kept
+    and the cached packets are not even iterated.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="test_empty_known_list",
+        options={
+            "ramses_rf": {},
+            "serial_port": {SZ_PORT_NAME: "/dev/ttyUSB0"},
+            CONF_SCHEMA: {},
+        },
+    )
+    entry.add_to_hass(hass)
+
+    coordinator = RamsesCoordinator(hass, entry)
+    packets = MagicMock(spec=dict)
+    client_state = {SZ_PACKETS: packets}
+
+    assert coordinator._get_saved_packets(client_state) == {}
+    packets.items.assert_not_called()
+
+
 async def test_passive_scan_migration(hass: HomeAssistant) -> None:
     """Test that passive scan setup does not migrate known_list-only devices.
 
@@ -3836,7 +3857,6 @@ async def test_passive_scan_migration(hass: HomeAssistant) -> None:
 
     # Backup should NOT have been called (no migration)
     coordinator.store.async_save_backup.assert_not_called()
-    await asyncio.sleep(0)
 
 
 async def test_passive_scan_schema_wiped_skips_migration(
@@ -3890,7 +3910,6 @@ async def test_passive_scan_schema_wiped_skips_migration(
 
     # Backup should NOT have been called (no migration)
     coordinator.store.async_save_backup.assert_not_called()
-    await asyncio.sleep(0)
 
 
 async def test_passive_scan_no_migration_when_schema_has_device(
@@ -3929,7 +3948,6 @@ async def test_passive_scan_no_migration_when_schema_has_device(
 
     # No migration needed — device already in schema
     coordinator.store.async_save_backup.assert_not_called()
-    await asyncio.sleep(0)
 
 
 async def test_passive_scan_no_migration_when_scan_disabled(
@@ -3962,7 +3980,6 @@ async def test_passive_scan_no_migration_when_scan_disabled(
 
     # Passive scan is off — no migration
     coordinator.store.async_save_backup.assert_not_called()
-    await asyncio.sleep(0)
 
 
 # ───────────────────────────────────────────────────────────────────────
@@ -168,7 +168,10 @@ async def test_fan_setup_already_initialized(
 async def test_setup_fan_bound_success_rem(
     mock_coordinator: RamsesCoordinator, mock_fan_device: MagicMock
 ) -> None:
-    """Test successful binding of a FAN to a REM device."""
+    """Test successful binding of a FAN to a REM device.
+
+    The schema holds a single _bound string, which is normalized to a list.
+    """
     bound_id = "32:111111"
 
     # Configure the schema with the bound device
@@ -714,41 +717,3 @@ async def test_setup_fan_bound_mixed_rem_and_co2_as_rem(
     mock_fan_device.add_bound_device.assert_any_call(co2_id, DevType.REM)
     assert mock_coordinator.fan_handler._fan_bound_to_remote[rem_id] == FAN_ID
     assert mock_coordinator.fan_handler._fan_bound_to_remote[co2_id] == FAN_ID
-
-
-async def test_setup_fan_bound_single_str_normalized_to_list(
-    mock_coordinator: RamsesCoordinator, mock_fan_device: MagicMock
-) -> None:
-    """Test that a single _bound string is normalized to a list internally."""
-    bound_id = "32:111111"
-
-    mock_coordinator.options[CONF_SCHEMA] = {FAN_ID: {SZ_TR_BOUND: bound_id}}
-
-    bound_device = MagicMock()
-    bound_device.id = bound_id
-    mock_coordinator._get_device = MagicMock(return_value=bound_device)
-
-    class MockHvacVentilator:
-        pass
-
-    class MockHvacRemoteBase:
-        pass
-
-    mock_fan_device.__class__ = MockHvacVentilator  # type: ignore[assignment]
-    bound_device.__class__ = MockHvacRemoteBase  # type: ignore[assignment]
-
-    with (
-        patch(
-            "custom_components.ramses_cc.fan_handler.HvacVentilator",
-            MockHvacVentilator,
-        ),
-        patch(
-            "custom_components.ramses_cc.fan_handler.HvacRemoteBase",
-            MockHvacRemoteBase,
-        ),
-    ):
-        await mock_coordinator.fan_handler.setup_fan_bound_devices(mock_fan_device)
-
-    # Single string should still work (normalized to list internally)
-    mock_fan_device.add_bound_device.assert_called_once_with(bound_id, DevType.REM)
-    assert mock_coordinator.fan_handler._fan_bound_to_remote[bound_id] == FAN_ID
@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import logging
 from collections.abc import Iterator
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -178,7 +179,10 @@ async def test_bridge_flow(
 
 
 async def test_bridge_subscriptions_and_errors(
-    hass: HomeAssistant, mock_mqtt: dict[str, Any], mock_protocol: MagicMock
+    hass: HomeAssistant,
+    mock_mqtt: dict[str, Any],
+    mock_protocol: MagicMock,
+    caplog: pytest.LogCaptureFixture,
 ) -> None:
     """Test subscription idempotency and error handling."""
     bridge = RamsesMqttBridge(hass, "RAMSES/GATEWAY", TEST_DEVICE_ID)
@@ -198,10 +202,11 @@ async def test_bridge_subscriptions_and_errors(
     bridge._sub_cmd = None
     mock_mqtt["subscribe"].side_effect = Exception("MQTT Boom")
 
-    with patch("custom_components.ramses_cc.mqtt_bridge._LOGGER") as mock_logger:
+    with caplog.at_level(logging.ERROR, logger="custom_components.ramses_cc"):
         await bridge.async_transport_factory(mock_protocol)
-        assert mock_logger.error.call_count >= 1
-        assert "Failed to subscribe to MQTT" in mock_logger.error.call_args[0][0]
+    errors = [r for r in caplog.records if r.levelno >= logging.ERROR]
+    assert errors
+    assert "Failed to subscribe to MQTT" in errors[-1].getMessage()
 
 
 async def test_bridge_rx_edge_cases(
@@ -626,27 +626,6 @@ async def test_learn_command(hass: HomeAssistant) -> None:
     assert "fail_cmd" not in remote._commands
 
 
-@pytest.mark.skip
-async def test_learn_command_failure(hass: HomeAssistant) -> None:
-    """Test the learn_command service failure."""
-    remote = RamsesRemote(
-        MagicMock(id=MOCK_DEV_ID),
-        MagicMock(unique_id="unique_id"),
-        MagicMock(),
-    )
-    remote.entity_id = "remote.test_remote"
-    # Use a standalone mock for hass
-    remote.hass = MagicMock()
-    remote._commands = {}
-    cast(Any, remote)._coordinator = MagicMock()
-
-    # The implementation returns silently on timeout.
-    # We assert that the command was NOT added to the commands list.
-    await remote.async_learn_command(command=["fail_cmd"], timeout=0.001)
-
-    assert "fail_cmd" not in remote._commands
-
-
 async def test_setup_entry_platform(hass: HomeAssistant) -> None:
     """Test platform setup."""
     mock_coordinator = MagicMock()
@@ -0,0 +1,207 @@
+"""Tests for the pure (registry-free) helpers of RamsesServiceHandler.
+
+These tests do not need a Home Assistant instance: the module is marked
+``no_hass`` so that conftest does not set one up for each test, and it
+deliberately avoids importing the HA registries.
+"""
+
+import logging
+from collections.abc import Generator
+from typing import Any, Final, cast
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from custom_components.ramses_cc import services as _svc
+from custom_components.ramses_cc.services import RamsesServiceHandler
+from ramses_tx.dtos import CommandDTO
+from ramses_tx.exceptions import PacketAddrSetInvalid
+
+# Constants
+HGI_ID = "18:006402"
+SENTINEL_ID = "18:000730"
+
+_SERVICES_LOGGER = "custom_components.ramses_cc.services"
+
+pytestmark = pytest.mark.no_hass
+
+
+@pytest.fixture(scope="module")
+def service_handler() -> RamsesServiceHandler:
+    """Return a service handler wired to a Mock coordinator.
+
+    The tests in this module never mutate the handler (patches are scoped to
+    the test), so a single instance is shared across the module.
+
+    :return: A RamsesServiceHandler whose coordinator is a Mock.
+    """
+    coordinator = Mock()
+    mock_client = cast(Any, coordinator.client)
+    mock_client.hgi.id = HGI_ID
+    return RamsesServiceHandler(coordinator)
+
+
+@pytest.fixture
+def mock_pkt_addrs() -> Generator[MagicMock]:
+    """Patch the packet address validator used by _adjust_sentinel_packet.
+
+    :yield: The MagicMock standing in for ``services.pkt_addrs``.
+    """
+    with patch.object(_svc, "pkt_addrs") as pkt_addrs:
+        yield pkt_addrs
+
+
+def test_adjust_sentinel_packet_swaps_on_invalid(
+    service_handler: RamsesServiceHandler, mock_pkt_addrs: MagicMock
+) -> None:
+    """Test that addresses are swapped when validation fails for sentinel packet."""
+    cmd = CommandDTO(
+        verb=" I",
+        addr1=SENTINEL_ID,
+        addr2=HGI_ID,
+        addr3="--:------",
+        code="1F09",
+        payload="FF",
+    )
+
+    mock_pkt_addrs.side_effect = PacketAddrSetInvalid("Invalid structure")
+    result = service_handler._adjust_sentinel_packet(cmd)
+
+    assert result.addr2 == "--:------"
+    assert result.addr3 == HGI_ID
+
+
+def test_adjust_sentinel_packet_no_swap_on_valid(
+    service_handler: RamsesServiceHandler, mock_pkt_addrs: MagicMock
+) -> None:
+    """Test that addresses are NOT swapped when validation passes."""
+    cmd = CommandDTO(
+        verb=" I",
+        addr1=SENTINEL_ID,
+        addr2=HGI_ID,
+        addr3="--:------",
+        code="1F09",
+        payload="FF",
+    )
+
+    mock_pkt_addrs.return_value = True
+    result = service_handler._adjust_sentinel_packet(cmd)
+    assert result.addr2 == HGI_ID
+    assert result.addr3 == "--:------"
+
+
+def test_adjust_sentinel_packet_ignores_other_devices(
+    service_handler: RamsesServiceHandler,
+) -> None:
+    """Test that logic is skipped for non-sentinel devices."""
+    cmd = CommandDTO(
+        verb=" I",
+        addr1="01:123456",  # Not sentinel
+        addr2=HGI_ID,
+        addr3="--:------",
+        code="30C9",
+        payload="000834",
+    )
+
+    result = service_handler._adjust_sentinel_packet(cmd)
+    assert result.addr1 == "01:123456"
+    assert result.addr2 == HGI_ID
+    assert result.addr3 == "--:------"
+
+
+def test_adjust_sentinel_packet_early_return(
+    service_handler: RamsesServiceHandler, mock_pkt_addrs: MagicMock
+) -> None:
+    """Test _adjust_sentinel_packet returns early if addr1/addr2 don't match."""
+    cmd = CommandDTO(
+        verb=" I",
+        addr1="18:999999",  # Not sentinel
+        addr2="01:000000",  # Not HGI
+        addr3="--:------",
+        code="30C9",
+        payload="000834",
+    )
+
+    result = service_handler._adjust_sentinel_packet(cmd)
+    mock_pkt_addrs.assert_not_called()
+    assert result is cmd  # unchanged
+
+
+def test_get_param_id_validation(service_handler: RamsesServiceHandler) -> None:
+    """Test validation of parameter IDs in service calls."""
+    assert service_handler._get_param_id({"param_id": "01"}) == "01"
+
+    with pytest.raises(ValueError, match="Invalid parameter ID"):
+        service_handler._get_param_id({"param_id": "001"})
+
+    with pytest.raises(ValueError, match="Invalid parameter ID"):
+        service_handler._get_param_id({"param_id": "ZZ"})
+
+
+# (data, expected device_id, expect a 'Multiple values' warning)
+_RESOLVE_DEVICE_ID_CASES: Final = (
+    ({"device_id": ["01:111111", "01:222222"]}, "01:111111", True),
+    ({}, None, False),
+    ({"device_id": []}, None, False),
+    ({"device": []}, None, False),
+    ({"device_id": "01:123456"}, "01:123456", False),
+)
+
+
+@pytest.mark.parametrize(("data", "expected", "warns"), _RESOLVE_DEVICE_ID_CASES)
+def test_resolve_device_id(
+    service_handler: RamsesServiceHandler,
+    caplog: pytest.LogCaptureFixture,
+    data: dict[str, Any],
+    expected: str | None,
+    warns: bool,
+) -> None:
+    """Test _resolve_device_id with lists, empty lists and missing keys."""
+    caplog.set_level(logging.WARNING, logger=_SERVICES_LOGGER)
+    data = dict(data)  # the handler updates the input dict in place
+
+    assert service_handler._resolve_device_id(data) == expected
+    assert any("Multiple values" in r.message for r in caplog.records) is warns
+    if expected is not None:
+        assert data["device_id"] == expected  # Should update input dict
+
+
+def test_resolve_device_id_ha_device_list(
+    service_handler: RamsesServiceHandler, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test _resolve_device_id with a list of HA device ids."""
+    caplog.set_level(logging.WARNING, logger=_SERVICES_LOGGER)
+    data_ha_list: dict[str, Any] = {"device": ["ha_id_1", "ha_id_2"]}
+    # Mock _target_to_device_id on service_handler
+    with patch.object(
+        service_handler,
+        "_target_to_device_id",
+        return_value="01:555555",
+    ):
+        resolved_ha = service_handler._resolve_device_id(data_ha_list)
+        assert resolved_ha == "01:555555"
+        assert data_ha_list["device"] == "ha_id_1"
+    assert len(caplog.records) == 1
+    assert "Multiple values for 'device'" in caplog.records[0].message
+
+
+def test_resolve_device_id_target(service_handler: RamsesServiceHandler) -> None:
+    """Test _resolve_device_id falls back to the HA target selector."""
+    data: dict[str, Any] = {"target": {"entity_id": "climate.test"}}
+    with patch.object(
+        service_handler, "_target_to_device_id", return_value="02:222222"
+    ) as mock_target:
+        assert service_handler._resolve_device_id(data) == "02:222222"
+
+    mock_target.assert_called_once_with({"entity_id": "climate.test"})
+    assert data["device_id"] == "02:222222"
+
+
+def test_resolve_device_id_single_item_list(
+    service_handler: RamsesServiceHandler,
+) -> None:
+    """Test resolving device ID from a list with exactly one item."""
+    data: dict[str, Any] = {"device_id": ["30:111111"]}
+    resolved = service_handler._resolve_device_id(data)
+    assert resolved == "30:111111"
+    assert data["device_id"] == "30:111111"
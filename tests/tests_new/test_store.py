@@ -1,17 +1,15 @@
-"""Tests for the storage aspect of RamsesCoordinator (Persistence)."""
+"""Tests for the storage aspect of ramses_cc (RamsesStore persistence).
 
-import asyncio
-from datetime import datetime as dt, timedelta as td
-from typing import Any, cast
-from unittest.mock import AsyncMock, MagicMock, patch
+The coordinator's use of the store (startup packet filtering, saving the
+client state) is covered in test_coordinator.py.
+"""
+
+from typing import Any
+from unittest.mock import AsyncMock, patch
 
-import pytest
 from homeassistant.core import HomeAssistant
-from homeassistant.util import dt as dt_util
 
 from custom_components.ramses_cc.const import (
-    CONF_RAMSES_RF,
-    CONF_SCHEMA,
     SZ_CLIENT_STATE,
     SZ_HVAC_SCHEMA,
     SZ_PACKETS,
@@ -19,15 +17,13 @@ from custom_components.ramses_cc.const import (
     SZ_SCHEMA,
     SZ_TR_COMMANDS,
 )
-from custom_components.ramses_cc.coordinator import RamsesCoordinator
 from custom_components.ramses_cc.discovery import SZ_DISCOVERY
 from custom_components.ramses_cc.store import RamsesCcStore, RamsesStore
-from ramses_rf.gateway import Gateway
 
 REM_ID = "32:111111"
 
 
-# -- Part 1: Unit Tests for RamsesStore (Fixes Coverage) --
+# -- Unit Tests for RamsesStore (Fixes Coverage) --
 
 
 async def test_store_init(hass: HomeAssistant) -> None:
@@ -165,6 +161,77 @@ async def test_store_async_save(hass: HomeAssistant) -> None:
     store._store.async_save.assert_called_once_with(expected_data)
 
 
+async def test_store_async_save_skips_unchanged(hass: HomeAssistant) -> None:
+    """Test that a save identical to the stored data is not written again."""
+    store = RamsesStore(hass)
+    store._store = AsyncMock()
+
+    schema: dict[str, Any] = {"01:123456": {"_alias": "CTL"}}
+    packets: dict[str, Any] = {"2024-01-01T12:00:00": "packet_data"}
+    stored = {
+        "client_state": {"schema": dict(schema), "packets": dict(packets)},
+        "remotes": {},
+    }
+
+    store._store.async_load.return_value = stored
+    await store.async_save(schema, dict(packets), {})
+    store._store.async_save.assert_not_called()
+
+    # Another writer (e.g. a discovery reset) has changed the stored data
+    store._store.async_load.return_value = {**stored, "remotes": {"x": {}}}
+    await store.async_save(schema, dict(packets), {})
+    store._store.async_save.assert_awaited_once()
+
+    packets["2024-01-01T12:01:00"] = "new_packet_data"
+    store._store.async_load.return_value = stored
+    await store.async_save(schema, dict(packets), {})
+    assert store._store.async_save.await_count == 2
+
+
+async def test_store_async_save_round_trip(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that saved data (encoded in the executor) loads back unchanged."""
+    schema: dict[str, Any] = {"01:123456": {"_alias": "CTL"}}
+    packets: dict[str, Any] = {
+        "2024-01-01T12:00:00.000000": "legacy_packet_string",
+        "2024-01-01T12:01:00.000000": {"code": "313F", "src": "01:123456"},
+    }
+    remotes: dict[str, Any] = {REM_ID: {"boost": "packet_data"}}
+
+    await RamsesStore(hass).async_save(schema, packets, remotes)
+
+    assert await RamsesStore(hass).async_load() == {
+        SZ_CLIENT_STATE: {SZ_SCHEMA: schema, SZ_PACKETS: packets},
+        SZ_REMOTES: remotes,
+    }
+
+
+async def test_store_async_save_snapshots_live_data(hass: HomeAssistant) -> None:
+    """Test that saved remotes/schema/packets are unaffected by later mutation."""
+    store = RamsesStore(hass)
+    store._store = AsyncMock()
+
+    schema: dict[str, Any] = {"01:123456": {"_alias": "CTL"}}
+    packets: dict[str, Any] = {"2024-01-01T12:00:00": {"code": "313F"}}
+    remotes: dict[str, Any] = {REM_ID: {"boost": "packet_data"}}
+
+    await store.async_save(schema, packets, remotes)
+
+    # e.g. learn_command adding a command while the executor encodes
+    remotes[REM_ID]["auto"] = "other_packet"
+    schema["01:123456"]["_alias"] = "Renamed"
+    packets["2024-01-01T12:00:00"]["code"] = "1F09"
+    packets["2024-01-01T12:01:00"] = "new_packet_data"
+
+    saved_data = store._store.async_save.call_args[0][0]
+    assert saved_data[SZ_REMOTES] == {REM_ID: {"boost": "packet_data"}}
+    assert saved_data[SZ_CLIENT_STATE][SZ_SCHEMA] == {"01:123456": {"_alias": "CTL"}}
+    assert saved_data[SZ_CLIENT_STATE][SZ_PACKETS] == {
+        "2024-01-01T12:00:00": {"code": "313F"}
+    }
+
+
 async def test_store_async_save_with_discovery(hass: HomeAssistant) -> None:
     """Test saving data with discovery state included."""
     store = RamsesStore(hass)
@@ -338,166 +405,3 @@ async def test_store_async_load_backups(hass: HomeAssistant) -> None:
     store._store.async_load.return_value = {}
     result = await store.async_load_backups()
     assert result == []
-
-
-# -- Part 2: Integration Tests for Coordinator Persistence (Existing Tests) --
-
-
-@pytest.fixture
-def mock_hass(event_loop: asyncio.AbstractEventLoop) -> MagicMock:
-    """Return a mock Home Assistant instance."""
-    hass = MagicMock()
-    hass.loop = event_loop  # Use the actual test event loop
-
-    # Use an AsyncMock for async_create_task so it's awaited correctly by HA
-    hass.async_create_task = MagicMock(
-        side_effect=lambda coro: event_loop.create_task(coro)
-    )
-
-    return hass
-
-
-@pytest.fixture
-def mock_entry() -> MagicMock:
-    """Return a mock ConfigEntry."""
-    entry = MagicMock()
-    entry.entry_id = "test_entry"
-    entry.options = {
-        CONF_SCHEMA: {"18:006402": {"_class": "HGI"}},
-        CONF_RAMSES_RF: {},
-        "serial_port": "/dev/ttyUSB0",
-    }
-    entry.async_on_unload = MagicMock()
-    return entry
-
-
-@pytest.fixture
-def mock_coordinator(hass: HomeAssistant, mock_entry: MagicMock) -> RamsesCoordinator:
-    """Return a mock coordinator for storage tests."""
-    # We use the real RamsesCoordinator but mock its internal store/client
-    coordinator = RamsesCoordinator(hass, mock_entry)
-
-    # Mock the store for persistence tests
-    coordinator.store = MagicMock()
-    coordinator.store.async_load = AsyncMock()
-    coordinator.store.async_save = AsyncMock()
-
-    # Pre-set the client as a MagicMock with Gateway spec
-    coordinator.client = MagicMock(spec=Gateway)
-    coordinator.client.start = AsyncMock()
-    return coordinator
-
-
-async def test_setup_with_corrupted_storage_dates(
-    hass: HomeAssistant, mock_entry: MagicMock
-) -> None:
-    """Test that startup survives invalid date strings in storage."""
-    # 1. Setup Coordinator
-    coordinator = RamsesCoordinator(hass, mock_entry)
-
-    # 2. Mock Storage with corrupted date
-    # Phase 4: enforce_known_list is always-on, so the valid packet must
-    # contain a device ID that exists in the schema-derived known_list.
-    now: dt = dt_util.now()
-    timestamp: str = now.isoformat()
-    mock_storage_data = {
-        SZ_CLIENT_STATE: {
-            SZ_PACKETS: {
-                timestamp: "00 18:006402 01:145038 ... valid packet ...",
-                "INVALID-DATE-STRING": "00 ... corrupted packet ...",
-            }
-        }
-    }
-
-    coordinator.store = MagicMock()  # Ensure store is mocked
-    coordinator.store.async_load = AsyncMock(return_value=mock_storage_data)
-
-    # Ensure _create_client returns the mock that we check later
-    mock_client = MagicMock(spec=Gateway)
-    mock_client.start = AsyncMock()
-    coordinator._create_client = MagicMock(return_value=mock_client)
-
-    # 3. Run async_setup
-    await coordinator.async_setup()
-
-    # 4. Yield to the event loop
-    await asyncio.sleep(0)
-
-    # 5. Verify client started
-    assert mock_client.start.called
-
-    # 6. Verify only valid packet was passed to start
-    call_args = mock_client.start.call_args
-    cached_packets = call_args.kwargs.get("cached_packets", {})
-
-    assert len(cached_packets) == 1
-    assert "INVALID-DATE-STRING" not in cached_packets
-    await asyncio.sleep(0)
-
-
-async def test_save_client_state_remotes(mock_coordinator: RamsesCoordinator) -> None:
-    """Test saving remote commands to persistent storage."""
-    # Type Guard for Pyright
-    assert mock_coordinator.client is not None
-
-    # Cast methods to MagicMock to access test attributes
-    cast(MagicMock, mock_coordinator.client.get_state).return_value = ({}, {})
-    mock_coordinator._remotes = {REM_ID: {"boost": "packet_data"}}
-
-    # Reset mocks to clear any setup calls
-    cast(MagicMock, mock_coordinator.store.async_save).reset_mock()
-
-    await mock_coordinator.async_save_client_state()
-
-    # Verify remotes were included in the save payload
-    assert cast(MagicMock, mock_coordinator.store.async_save).called
-    args = cast(MagicMock, mock_coordinator.store.async_save).call_args[0]
-    saved_remotes = args[2]
-
-    assert saved_remotes == mock_coordinator._remotes
-
-
-async def test_setup_packet_filtering(
-    hass: HomeAssistant, mock_entry: MagicMock
-) -> None:
-    """Test logic for filtering cached packets based on age and known list."""
-    coordinator = RamsesCoordinator(hass, mock_entry)
-
-    mock_client = MagicMock(spec=Gateway)
-    mock_client.start = AsyncMock()
-    coordinator._create_client = MagicMock(return_value=mock_client)
-
-    now: dt = dt_util.now()
-    old_date = (now - td(days=2)).isoformat()
-    recent_date = (now - td(hours=1)).isoformat()
-
-    # Phase 4: known_list is derived from schema, enforce_known_list is always-on
-    coordinator.options[CONF_SCHEMA] = {"01:123456": {}}
-    coordinator.options[CONF_RAMSES_RF] = {}
-
-    padding = " " * 11
-    valid_packet = f"{padding}01:123456" + (" " * 20)
-    unknown_packet = f"{padding}99:999999" + (" " * 20)
-
-    mock_storage_data = {
-        SZ_CLIENT_STATE: {
-            SZ_PACKETS: {
-                old_date: valid_packet,
-                recent_date: valid_packet,
-                (now - td(minutes=1)).isoformat(): unknown_packet,
-            }
-        }
-    }
-    coordinator.store = MagicMock()
-    coordinator.store.async_load = AsyncMock(return_value=mock_storage_data)
-
-    await coordinator.async_setup()
-
-    mock_client.start.assert_called_once()
-    packets = mock_client.start.call_args.kwargs["cached_packets"]
-
-    assert recent_date in packets
-    assert old_date not in packets
-    assert len(packets) == 1
-
-    await asyncio.sleep(0)
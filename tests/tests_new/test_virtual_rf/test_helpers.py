@@ -85,3 +85,27 @@ async def test_ensure_fakeable_idempotent() -> None:
 
         # Verify it exited early (no _bind_context should be assigned)
         assert not hasattr(dev, "_bind_context")
+
+
+async def test_ensure_fakeable_reuses_class() -> None:
+    """Test that devices of the same class share one Fakeable subclass."""
+
+    class DummyDevice(Device):
+        def __init__(self) -> None:
+            pass
+
+    class MockFakeable:
+        pass
+
+    devs = [DummyDevice(), DummyDevice()]
+    with (
+        patch("tests.virtual_rf.helpers.Fakeable", MockFakeable),
+        patch("tests.virtual_rf.helpers.BindingManager"),
+    ):
+        for dev in devs:
+            dev._gwy = MagicMock()
+            helpers.ensure_fakeable(dev, make_fake=False)
+
+    assert devs[0].__class__ is devs[1].__class__
+    assert issubclass(devs[0].__class__, DummyDevice)
+    assert issubclass(devs[0].__class__, MockFakeable)
@@ -1,7 +1,8 @@
 """Tests for the virtual_rf.virtual_rf module."""
 
 import asyncio
-from typing import Any, cast
+from collections.abc import Callable, Generator
+from typing import Any, Final, cast
 from unittest.mock import patch
 
 import pytest
@@ -10,23 +11,99 @@ from serial import serial_for_url  # type: ignore[import-untyped]
 from tests.virtual_rf import HgiFwTypes, VirtualRf
 from tests.virtual_rf.virtual_rf import VirtualRfBase, main
 
+# An RQ frame as sent by a client, with addr0 as the 18:000730 sentinel
+_RQ_FRAME_TMPL: Final = b"RQ --- %s 01:123456 --:------ 0006 001 00\r\n"
+_RQ_FRAME: Final = _RQ_FRAME_TMPL % b"18:000730"
 
-async def async_wait_for_serial(serial_port: Any, timeout: float = 0.5) -> None:
-    """Asynchronously wait for bytes to hit the hardware buffer.
 
-    :param serial_port: The serial port instance to monitor.
+class _SerialPorts(dict[str, Any]):
+    """A mapping of port name to pyserial instance, opened on first lookup."""
+
+    def __missing__(self, port: str) -> Any:
+        ser = self[port] = serial_for_url(port, timeout=0)
+        return ser
+
+
+@pytest.fixture
+def sers() -> Generator[_SerialPorts]:
+    """Provide client connections to VirtualRf ports, closed at teardown.
+
+    Each port is opened at most once per test, however often it is looked up.
+
+    :yield: A mapping that opens a port's serial instance on first access.
+    """
+    ports = _SerialPorts()
+    try:
+        yield ports
+    finally:
+        for ser in ports.values():
+            ser.close()
+
+
+async def _wait_until(predicate: Callable[[], bool], timeout: float = 0.5) -> None:
+    """Yield to the event loop until a condition holds.
+
+    Each turn of the loop lets the VirtualRf reader callbacks run, so this
+    returns as soon as the data has been dispatched, rather than after a
+    fixed sleep.
+
+    :param predicate: The condition to wait for.
     :param timeout: Maximum time to wait in seconds.
-    :raises TimeoutError: If no data arrives within the timeout.
+    :raises TimeoutError: If the condition does not hold within the timeout.
     """
     loop = asyncio.get_running_loop()
     end_time = loop.time() + timeout
 
-    while loop.time() < end_time:
-        if serial_port.in_waiting > 0:
-            return
-        await asyncio.sleep(0.01)
+    while not predicate():
+        if loop.time() > end_time:
+            raise TimeoutError("Timed out waiting for VirtualRf.")
+        await asyncio.sleep(0)
 
-    raise TimeoutError("Timed out waiting for serial data from VirtualRf.")
+
+async def async_wait_for_serial(
+    serial_port: Any, size: int = 1, timeout: float = 0.5
+) -> None:
+    """Asynchronously wait for bytes to hit the hardware buffer.
+
+    :param serial_port: The serial port instance to monitor.
+    :param size: The number of bytes to wait for.
+    :param timeout: Maximum time to wait in seconds.
+    :raises TimeoutError: If the data does not arrive within the timeout.
+    """
+    await _wait_until(lambda: serial_port.in_waiting >= size, timeout)
+
+
+async def async_wait_for_tx(
+    rf: VirtualRfBase, port: str, timeout: float = 0.5
+) -> list[tuple[str, str, bytes]]:
+    """Wait until a frame written to a port has been processed by the VirtualRf.
+
+    Used where nothing is expected back. A frame is cast (and any reply pushed)
+    in the same reader callback that logs it as SENT, so once that entry is
+    logged the returned entries include every RCVD it caused. New entries are
+    found after the last one logged before the wait, not counted, as the log
+    is a bounded deque. Call it straight after the write, before anything else
+    yields.
+
+    :param rf: The VirtualRf instance.
+    :param port: The port the frame was written to.
+    :param timeout: Maximum time to wait in seconds.
+    :return: The log entries added since the write.
+    :raises TimeoutError: If the frame is not processed within the timeout.
+    """
+    last = rf._log[-1] if rf._log else None
+
+    def new_entries() -> list[tuple[str, str, bytes]]:
+        log = list(rf._log)
+        for idx in range(len(log) - 1, -1, -1):
+            if log[idx] is last:
+                return log[idx + 1 :]
+        return log  # the last entry was pushed out of the deque
+
+    await _wait_until(
+        lambda: any(p == port and d == "SENT" for p, d, _ in new_entries()), timeout
+    )
+    return new_entries()
 
 
 async def test_virtual_rf_lifecycle() -> None:
@@ -74,23 +151,23 @@ async def test_virtual_rf_os_error() -> None:
         VirtualRf(1)
 
 
-async def test_virtual_rf_data_flow() -> None:
+async def test_virtual_rf_data_flow(sers: _SerialPorts) -> None:
     """Test that data written to one port is received by others."""
     rf = VirtualRf(2, start=True)
 
     # Use pyserial to emulate a real client connecting to the virtual port
     # Open connection to Port 0
-    ser_0 = serial_for_url(rf.ports[0], timeout=0)
+    ser_0 = sers[rf.ports[0]]
     # Open connection to Port 1
-    ser_1 = serial_for_url(rf.ports[1], timeout=0)
+    ser_1 = sers[rf.ports[1]]
 
     try:
         # Write data to Port 0
-        msg = b"RQ --- 18:000730 01:123456 --:------ 0006 001 00\r\n"
+        msg = _RQ_FRAME
         ser_0.write(msg)
 
-        # Give asyncio loop a moment to trigger the read callback and cast data
-        await asyncio.sleep(0.01)
+        # Wait for the read callback to cast the data (plus the RSSI)
+        await async_wait_for_serial(ser_1, len(msg) + 4)
 
         # Read from Port 1
         received = ser_1.read(ser_1.in_waiting)
@@ -98,8 +175,6 @@ async def test_virtual_rf_data_flow() -> None:
         assert received == b"000 " + msg
 
     finally:
-        ser_0.close()
-        ser_1.close()
         await rf.stop()
 
 
@@ -153,31 +228,33 @@ async def test_virtual_rf_set_gateway_invalid_fw() -> None:
 async def test_virtual_rf_stop_unstarted() -> None:
     """Test stopping an instance that wasn't started."""
     rf = VirtualRf(1, start=False)
-    # Should not raise error
-    await rf.stop()
+    port = rf.ports[0]
+    fp = rf._port_to_object[port]
 
+    # Should not raise error, and should still release the pty
+    await rf.stop()
+    assert fp.closed
+    assert rf.ports == []
 
-async def test_virtual_rf_dump_frames() -> None:
-    """Test dump_frames_to_rf execution."""
-    rf = VirtualRf(1, start=True)
+    await rf.stop()  # idempotent
 
-    # Just ensure it runs without error
-    await rf.dump_frames_to_rf([b"RQ --- 18:000730 01:123456 --:------ 0006 001 00"])
 
-    await rf.stop()
+# A tiny timeout ensures the wait_for path is executed
+@pytest.mark.parametrize("timeout", [None, 0.01])
+async def test_virtual_rf_dump_frames(timeout: float | None) -> None:
+    """Test dump_frames_to_rf with a batch of frames, with and without a timeout."""
+    rf = VirtualRf(1, start=True)
+    frames = [
+        f"RQ --- 18:000730 01:{i:06d} --:------ 0006 001 00".encode() for i in range(8)
+    ]
 
+    await rf.dump_frames_to_rf(frames, timeout=timeout)
 
-async def test_virtual_rf_dump_frames_timeout() -> None:
-    """Test dump_frames_to_rf with a timeout to cover that branch."""
-    rf = VirtualRf(1, start=True)
-    # Run with a tiny timeout to ensure the wait_for path is executed
-    await rf.dump_frames_to_rf(
-        [b"RQ --- 18:000730 01:123456 --:------ 0006 001 00"], timeout=0.01
-    )
+    assert [d for p, _, d in rf._log if p == "/dev/mock"] == frames
     await rf.stop()
 
 
-async def test_virtual_rf_hgi80_logic() -> None:
+async def test_virtual_rf_hgi80_logic(sers: _SerialPorts) -> None:
     """Test HGI80 specific logic (dropping invalid addr0, swapping addr0)."""
     rf = VirtualRf(2, start=True)
     hgi_id = "18:123456"
@@ -185,36 +262,32 @@ async def test_virtual_rf_hgi80_logic() -> None:
     # Setup Port 0 as HGI80
     rf.set_gateway(rf.ports[0], hgi_id, HgiFwTypes.HGI_80)
 
-    ser_0 = serial_for_url(rf.ports[0], timeout=0)
-    ser_1 = serial_for_url(rf.ports[1], timeout=0)
+    ser_0 = sers[rf.ports[0]]
+    ser_1 = sers[rf.ports[1]]
 
     try:
         # 1. Send packet with WRONG addr0 (not 18:000730) -> Should be dropped
         # Using a raw string that represents a packet where addr0 (src) is NOT the sentinel
         msg_drop = b"RQ --- 18:999999 01:123456 --:------ 0006 001 00\r\n"
         ser_0.write(msg_drop)
-        await asyncio.sleep(0.01)
-        assert ser_1.in_waiting == 0  # Nothing received
+        entries = await async_wait_for_tx(rf, rf.ports[0])
+        assert not [p for p, d, _ in entries if d == "RCVD"]  # Nothing received
 
         # 2. Send packet with CORRECT addr0 (18:000730) -> Should be swapped to hgi_id
-        msg_send = b"RQ --- 18:000730 01:123456 --:------ 0006 001 00\r\n"
+        msg_send = _RQ_FRAME
         ser_0.write(msg_send)
-        await asyncio.sleep(0.01)
+        # Expect RSSI header + swapped address
+        expected_frame = _RQ_FRAME_TMPL % hgi_id.encode()
+        await async_wait_for_serial(ser_1, len(expected_frame) + 4)
 
         received = ser_1.read(ser_1.in_waiting)
-        # Expect RSSI header + swapped address
-        expected_frame = (
-            b"RQ --- " + hgi_id.encode() + b" 01:123456 --:------ 0006 001 00\r\n"
-        )
         assert received == b"000 " + expected_frame
 
     finally:
-        ser_0.close()
-        ser_1.close()
         await rf.stop()
 
 
-async def test_virtual_rf_reply_mechanism() -> None:
+async def test_virtual_rf_reply_mechanism(sers: _SerialPorts) -> None:
     """Test the mocked reply mechanism."""
     rf = VirtualRf(2, start=True)
 
@@ -223,12 +296,12 @@ async def test_virtual_rf_reply_mechanism() -> None:
 
     rf.add_reply_for_cmd(cmd_pattern, reply_payload)
 
-    ser_0 = serial_for_url(rf.ports[0], timeout=0)
-    ser_1 = serial_for_url(rf.ports[1], timeout=0)  # Receiver to check cast
+    ser_0 = sers[rf.ports[0]]
+    ser_1 = sers[rf.ports[1]]  # Receiver to check cast
 
     try:
         # Send matching command
-        msg = b"RQ --- 18:000730 01:123456 --:------ 0006 001 00\r\n"
+        msg = _RQ_FRAME
         ser_0.write(msg)
 
         await async_wait_for_serial(ser_1, timeout=0.5)
@@ -241,11 +314,38 @@ async def test_virtual_rf_reply_mechanism() -> None:
         assert b"00050135" in data
 
     finally:
-        ser_0.close()
-        ser_1.close()
         await rf.stop()
 
 
+async def test_virtual_rf_find_reply_for_cmd() -> None:
+    """Test that reply patterns are matched, and re-adding one replaces its reply."""
+    rf = VirtualRf(1, start=False)
+    frame = _RQ_FRAME
+
+    assert rf._find_reply_for_cmd(frame) is None
+
+    rf.add_reply_for_cmd(
+        r"RQ.* 0006 001 00", "RP --- 01:123456 18:000730 --:------ 0006 004 00050135"
+    )
+    rf.add_reply_for_cmd(
+        r"RQ.* 0006 001 00", "RP --- 01:123456 18:000730 --:------ 0006 004 00050136"
+    )
+    rf.add_reply_for_cmd(
+        r"RQ.* 1F09 001 00", "RP --- 01:123456 18:000730 --:------ 1F09 003 FF0000"
+    )
+
+    assert len(rf._replies) == 2
+    assert rf._find_reply_for_cmd(frame) == (
+        b"RP --- 01:123456 18:000730 --:------ 0006 004 00050136\r\n"
+    )
+    assert (
+        rf._find_reply_for_cmd(b"RQ --- 18:000730 01:123456 --:------ 3150 001 00\r\n")
+        is None
+    )
+
+    await rf.stop()
+
+
 async def test_read_ready_exception(caplog: pytest.LogCaptureFixture) -> None:
     """Test exception handling in _read_ready."""
     rf = VirtualRf(1, start=True)
@@ -309,7 +409,7 @@ async def test_read_ready_internal_os_error() -> None:
     await rf.stop()
 
 
-async def test_edge_cases_rx_tx() -> None:
+async def test_edge_cases_rx_tx(sers: _SerialPorts) -> None:
     """Test edge cases for _proc_after_rx and _proc_before_tx."""
     rf = VirtualRf(2, start=True)
 
@@ -318,51 +418,47 @@ async def test_edge_cases_rx_tx() -> None:
     rf.set_gateway(rf.ports[0], "18:000000", HgiFwTypes.HGI_80)
     # Port 1 has no gateway
 
-    ser_0 = serial_for_url(rf.ports[0], timeout=0)
-    ser_1 = serial_for_url(rf.ports[1], timeout=0)
+    ser_0 = sers[rf.ports[0]]
+    ser_1 = sers[rf.ports[1]]
 
     try:
         # Send !V to HGI80 (should be ignored)
         ser_0.write(b"!V\r\n")
-        await asyncio.sleep(0.01)
-        assert ser_0.in_waiting == 0  # No response
+        entries = await async_wait_for_tx(rf, rf.ports[0])
+        assert (rf.ports[0], "RCVD") not in [(p, d) for p, d, _ in entries]
 
         # Send !V to generic port (should be ignored)
         ser_1.write(b"!V\r\n")
-        await asyncio.sleep(0.01)
-        assert ser_1.in_waiting == 0  # No response
+        entries = await async_wait_for_tx(rf, rf.ports[1])
+        assert (rf.ports[1], "RCVD") not in [(p, d) for p, d, _ in entries]
 
     finally:
-        ser_0.close()
-        ser_1.close()
         await rf.stop()
 
 
-async def test_tx_from_non_gateway() -> None:
+async def test_tx_from_non_gateway(sers: _SerialPorts) -> None:
     """Test transmitting from a port with no attached gateway."""
     rf = VirtualRf(2, start=True)
     # Port 0 has no gateway set
 
-    ser_0 = serial_for_url(rf.ports[0], timeout=0)
-    ser_1 = serial_for_url(rf.ports[1], timeout=0)
+    ser_0 = sers[rf.ports[0]]
+    ser_1 = sers[rf.ports[1]]
 
     try:
         # Send normal frame
-        msg = b"RQ --- 18:000730 01:123456 --:------ 0006 001 00\r\n"
+        msg = _RQ_FRAME
         ser_0.write(msg)
-        await asyncio.sleep(0.01)
+        await async_wait_for_serial(ser_1, len(msg) + 4)
 
         received = ser_1.read(ser_1.in_waiting)
         # Should be echoed (with RSSI prepended by RX logic of dest port)
         assert received == b"000 " + msg
 
     finally:
-        ser_0.close()
-        ser_1.close()
         await rf.stop()
 
 
-async def test_virtual_rf_base_behavior() -> None:
+async def test_virtual_rf_base_behavior(sers: _SerialPorts) -> None:
     """Test VirtualRfBase directly to cover base class methods."""
     rf = VirtualRfBase(2)
     rf.start()
@@ -371,46 +467,42 @@ async def test_virtual_rf_base_behavior() -> None:
     assert len(rf.comports()) == 2
     assert rf.comports()[0].device == rf.ports[0]
 
-    ser_0 = serial_for_url(rf.ports[0], timeout=0)
-    ser_1 = serial_for_url(rf.ports[1], timeout=0)
+    ser_0 = sers[rf.ports[0]]
+    ser_1 = sers[rf.ports[1]]
 
     try:
         # VirtualRfBase should just echo without modification (no RSSI)
         msg = b"TEST MSG\r\n"
         ser_0.write(msg)
-        await asyncio.sleep(0.01)
+        await async_wait_for_serial(ser_1, len(msg))
 
         received = ser_1.read(ser_1.in_waiting)
         assert received == msg  # Exact match, no "000 " prefix
 
     finally:
-        ser_0.close()
-        ser_1.close()
         await rf.stop()
 
 
-async def test_evofw3_special_commands() -> None:
+async def test_evofw3_special_commands(sers: _SerialPorts) -> None:
     """Test EVOFW3 specific commands (!V and invalid ones)."""
     rf = VirtualRf(2, start=True)
     rf.set_gateway(rf.ports[0], "18:000730", HgiFwTypes.EVOFW3)
 
-    ser_0 = serial_for_url(rf.ports[0], timeout=0)
+    ser_0 = sers[rf.ports[0]]
 
     try:
         # 1. Test !V command -> Should return version string
         ser_0.write(b"!V\r\n")
-        await asyncio.sleep(0.01)
+        await async_wait_for_serial(ser_0, len(b"# evofw3 0.7.1\r\n"))
         resp = ser_0.read(ser_0.in_waiting)
         assert b"# evofw3 0.7.1" in resp
 
         # 2. Test !Unknown command -> Should return nothing (None)
         ser_0.write(b"!K\r\n")
-        await asyncio.sleep(0.01)
-        resp = ser_0.read(ser_0.in_waiting)
-        assert resp == b""  # Nothing returned
+        entries = await async_wait_for_tx(rf, rf.ports[0])
+        assert (rf.ports[0], "RCVD") not in [(p, d) for p, d, _ in entries]
 
     finally:
-        ser_0.close()
         await rf.stop()
 
 
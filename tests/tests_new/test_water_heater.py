@@ -1,7 +1,8 @@
 """Tests for the water heater platform in ramses_cc."""
 
 from datetime import timedelta as td
-from typing import Any, cast
+from types import SimpleNamespace
+from typing import Any, Final, cast
 from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import pytest
@@ -27,32 +28,39 @@ from ramses_tx.exceptions import ProtocolSendFailed
 TEST_DEVICE_ID = "10:123456"
 SZ_ACTIVE = "active"
 
+# The DhwZone coroutine methods that the entity awaits
+_DHW_ASYNC_METHODS: Final = (
+    "set_mode",
+    "set_config",
+    "reset_mode",
+    "reset_config",
+    "set_boost_mode",
+    "get_schedule",
+    "set_schedule",
+)
+
 
 @pytest.fixture
-def mock_device() -> MagicMock:
-    """Return a mock DhwZone device."""
-    # Note: Do not use spec=DhwZone here as it prevents mocking 'tcs' if not explicitly in the class
-    device = MagicMock()
-    device.id = TEST_DEVICE_ID
-    device.mode = {"mode": ZoneMode.SCHEDULE, SZ_ACTIVE: True}
-    device.temperature = 55.0
-    device.setpoint = 60.0
-    device.params = {}
-    device.schedule = []
-    device.schedule_version = 1
-    device.tcs.system_mode = {SZ_SYSTEM_MODE: SystemMode.AUTO}
+def mock_device() -> SimpleNamespace:
+    """Return a stand-in DhwZone device.
+
+    The state is held as plain attributes; only the coroutine methods are mocks.
+    """
+    device = SimpleNamespace(
+        id=TEST_DEVICE_ID,
+        mode={"mode": ZoneMode.SCHEDULE, SZ_ACTIVE: True},
+        temperature=55.0,
+        setpoint=60.0,
+        params={},
+        schedule=[],
+        schedule_version=1,
+        tcs=SimpleNamespace(system_mode={SZ_SYSTEM_MODE: SystemMode.AUTO}),
+        sensor=MagicMock(),  # Sensor mock for fake temp
+    )
 
     # Async methods on the device
-    device.set_mode = AsyncMock()
-    device.set_config = AsyncMock()
-    device.reset_mode = AsyncMock()
-    device.reset_config = AsyncMock()
-    device.set_boost_mode = AsyncMock()
-    device.get_schedule = AsyncMock()
-    device.set_schedule = AsyncMock()
-
-    # Sensor mock for fake temp
-    device.sensor = MagicMock()
+    for name in _DHW_ASYNC_METHODS:
+        setattr(device, name, AsyncMock())
 
     return device
 
@@ -65,7 +73,7 @@ def mock_coordinator() -> MagicMock:
 
 @pytest.fixture
 def water_heater(
-    mock_coordinator: MagicMock, mock_device: MagicMock
+    mock_coordinator: MagicMock, mock_device: SimpleNamespace
 ) -> RamsesWaterHeater:
     """Return an instantiated RamsesWaterHeater entity."""
     description = MagicMock()
@@ -77,6 +85,16 @@ def water_heater(
     return entity
 
 
+def _only_call_kwargs(mock: AsyncMock) -> dict[str, Any]:
+    """Assert a device coroutine was awaited exactly once and return its kwargs.
+
+    :param mock: The AsyncMock standing in for the device method.
+    :return: The keyword arguments of the single await.
+    """
+    mock.assert_awaited_once()
+    return dict(mock.call_args.kwargs)
+
+
 async def test_async_setup_entry(hass: HomeAssistant) -> None:
     """Test the platform setup."""
     # Mock ConfigEntry
@@ -107,8 +125,8 @@ async def test_async_setup_entry(hass: HomeAssistant) -> None:
         callback_func = call_args[0][1]
 
         # Test the callback function (add_devices)
-        # Create a mock device that passes isinstance(device, DhwZone)
-        mock_device = MagicMock(spec=DhwZone)
+        # A bare DhwZone (its __init__ skipped) passes isinstance(device, DhwZone)
+        mock_device = object.__new__(DhwZone)
         mock_device.id = TEST_DEVICE_ID
 
         # Call the internal callback
@@ -122,33 +140,30 @@ async def test_async_setup_entry(hass: HomeAssistant) -> None:
         assert entities[0]._device == mock_device
 
 
+# (device mode, expected current_operation)
+_CURRENT_OPERATION_CASES: Final = (
+    ({"mode": ZoneMode.SCHEDULE}, STATE_AUTO),
+    ({"mode": ZoneMode.PERMANENT, SZ_ACTIVE: True}, STATE_ON),
+    ({"mode": ZoneMode.PERMANENT, SZ_ACTIVE: False}, STATE_OFF),
+    ({"mode": ZoneMode.TEMPORARY, SZ_ACTIVE: True}, STATE_BOOST),
+    ({"mode": ZoneMode.TEMPORARY, SZ_ACTIVE: False}, STATE_OFF),
+)
+
+
+@pytest.mark.parametrize(("mode", "expected"), _CURRENT_OPERATION_CASES)
 async def test_property_current_operation(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater,
+    mock_device: SimpleNamespace,
+    mode: dict[str, Any],
+    expected: str,
 ) -> None:
     """Test the current_operation property logic."""
-    # Case 1: Auto (Schedule)
-    mock_device.mode = {"mode": ZoneMode.SCHEDULE}
-    assert water_heater.current_operation == STATE_AUTO
-
-    # Case 2: On (Permanent & Active)
-    mock_device.mode = {"mode": ZoneMode.PERMANENT, SZ_ACTIVE: True}
-    assert water_heater.current_operation == STATE_ON
-
-    # Case 3: Off (Permanent & Inactive)
-    mock_device.mode = {"mode": ZoneMode.PERMANENT, SZ_ACTIVE: False}
-    assert water_heater.current_operation == STATE_OFF
-
-    # Case 4: Boost (Temporary & Active)
-    mock_device.mode = {"mode": ZoneMode.TEMPORARY, SZ_ACTIVE: True}
-    assert water_heater.current_operation == STATE_BOOST
-
-    # Case 5: Off (Temporary & Inactive)
-    mock_device.mode = {"mode": ZoneMode.TEMPORARY, SZ_ACTIVE: False}
-    assert water_heater.current_operation == STATE_OFF
+    mock_device.mode = mode
+    assert water_heater.current_operation == expected
 
 
 async def test_property_error_handling(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test property access handles ValueErrors/TypeErrors gracefully and caches states."""
 
@@ -182,7 +197,7 @@ async def test_property_error_handling(
 
 
 async def test_is_away_mode_on(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test is_away_mode_on property."""
     # Test True
@@ -195,7 +210,7 @@ async def test_is_away_mode_on(
 
 
 async def test_simple_properties(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test simple properties."""
     assert water_heater.current_temperature == 55.0
@@ -209,7 +224,7 @@ async def test_simple_properties(
 
 
 async def test_extra_state_attributes(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test integration-specific attributes."""
     # Re-establish clean mode data
@@ -231,89 +246,70 @@ async def test_extra_state_attributes(
         mock_aware.assert_called_once_with("some_time")
 
 
-async def test_async_set_operation_mode_auto(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+# (operation mode, expected zone mode, expected 'active'): AUTO leaves 'active'
+# unset; BOOST is tested separately as it also sets an 'until'
+_OPERATION_MODE_CASES: Final = (
+    (STATE_AUTO, ZoneMode.SCHEDULE, None),
+    (STATE_ON, ZoneMode.PERMANENT, True),
+    (STATE_OFF, ZoneMode.PERMANENT, False),
+)
+
+
+@pytest.mark.parametrize(("state", "mode", "active"), _OPERATION_MODE_CASES)
+async def test_async_set_operation_mode(
+    water_heater: RamsesWaterHeater,
+    mock_device: SimpleNamespace,
+    state: str,
+    mode: ZoneMode,
+    active: bool | None,
 ) -> None:
-    """Test setting operation mode to AUTO."""
-    await water_heater.async_set_operation_mode(STATE_AUTO)
+    """Test setting operation mode to AUTO, ON and OFF."""
+    await water_heater.async_set_operation_mode(state)
 
-    mock_device.set_mode.assert_awaited_once()
-    _, kwargs = mock_device.set_mode.call_args
-    assert kwargs["mode"] == ZoneMode.SCHEDULE
-    # Auto typically doesn't set active explicitly in this mapping logic unless strictly needed
-    assert kwargs["active"] is None
-    assert kwargs["active"] is None
+    kwargs = _only_call_kwargs(mock_device.set_mode)
+    assert kwargs == {"mode": mode, "active": active, "until": None}
 
 
 async def test_async_set_operation_mode_boost(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace, freezer: Any
 ) -> None:
     """Test setting operation mode to BOOST."""
-    # We use real dt.util to ensure voluptuous checks (cv.dt_util) pass.
-    # Mocking dt_util.dt_util often fails isinstance(x, dt_util) checks.
+    # We use real dt.util (with the clock frozen) so that voluptuous checks
+    # (cv.dt_util) pass. Mocking dt_util.dt_util often fails isinstance checks.
     now = dt_util.now()
     await water_heater.async_set_operation_mode(STATE_BOOST)
 
-    mock_device.set_mode.assert_awaited_once()
-    _, kwargs = mock_device.set_mode.call_args
-    assert kwargs["mode"] == ZoneMode.TEMPORARY
-    assert kwargs["active"] is True
-
-    # Verify 'until' is approximately 1 hour from now (allow 1s tolerance)
-    # We cannot check for exact equality due to execution time
-    assert abs((kwargs["until"] - (now + td(hours=1))).total_seconds()) < 1.0
-
-
-async def test_async_set_operation_mode_on(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
-) -> None:
-    """Test setting operation mode to ON."""
-    await water_heater.async_set_operation_mode(STATE_ON)
-
-    mock_device.set_mode.assert_awaited_once()
-    _, kwargs = mock_device.set_mode.call_args
-    assert kwargs["mode"] == ZoneMode.PERMANENT
-    assert kwargs["active"] is True
-
-
-async def test_async_set_operation_mode_off(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
-) -> None:
-    """Test setting operation mode to OFF."""
-    await water_heater.async_set_operation_mode(STATE_OFF)
-
-    mock_device.set_mode.assert_awaited_once()
-    _, kwargs = mock_device.set_mode.call_args
-    assert kwargs["mode"] == ZoneMode.PERMANENT
-    assert kwargs["active"] is False
+    # 'until' is 1 hour from now (the clock is frozen, so exactly)
+    kwargs = _only_call_kwargs(mock_device.set_mode)
+    assert kwargs == {
+        "mode": ZoneMode.TEMPORARY,
+        "active": True,
+        "until": now + td(hours=1),
+    }
 
 
 async def test_async_set_temperature(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test setting the target temperature."""
     await water_heater.async_set_temperature(temperature=65.0)
 
-    mock_device.set_config.assert_awaited_once()
-    _, kwargs = mock_device.set_config.call_args
+    kwargs = _only_call_kwargs(mock_device.set_config)
     assert kwargs["setpoint"] == 65.0
 
 
 async def test_async_set_dhw_params(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test setting advanced DHW parameters."""
     await water_heater.async_set_dhw_params(setpoint=50.0, overrun=5, differential=2.0)
 
-    mock_device.set_config.assert_awaited_once()
-    _, kwargs = mock_device.set_config.call_args
-    assert kwargs["setpoint"] == 50.0
-    assert kwargs["overrun"] == 5
-    assert kwargs["differential"] == 2.0
+    kwargs = _only_call_kwargs(mock_device.set_config)
+    assert kwargs == {"setpoint": 50.0, "overrun": 5, "differential": 2.0}
 
 
 async def test_async_set_dhw_mode_with_duration(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace, freezer: Any
 ) -> None:
     """Test setting DHW mode with a duration string."""
     now = dt_util.now()
@@ -323,16 +319,17 @@ async def test_async_set_dhw_mode_with_duration(
         mode=ZoneMode.TEMPORARY, active=True, duration=duration
     )
 
-    mock_device.set_mode.assert_awaited_once()
-    _, kwargs = mock_device.set_mode.call_args
-
     # Logic: duration is converted to 'until'
-    assert kwargs["until"] is not None
-    assert abs((kwargs["until"] - (now + duration)).total_seconds()) < 1.0
+    kwargs = _only_call_kwargs(mock_device.set_mode)
+    assert kwargs == {
+        "mode": ZoneMode.TEMPORARY,
+        "active": True,
+        "until": now + duration,
+    }
 
 
 async def test_integration_services(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test integration-specific service calls."""
     # fake_dhw_temp
@@ -355,7 +352,7 @@ async def test_integration_services(
 
 
 async def test_schedule_management(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test get and set schedule methods."""
     # Test Get
@@ -374,7 +371,7 @@ async def test_schedule_management(
 
 
 async def test_backend_error_handling(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
+    water_heater: RamsesWaterHeater, mock_device: SimpleNamespace
 ) -> None:
     """Test that backend errors raise ServiceValidationError or HomeAssistantError."""
     # Test set_mode error
@@ -426,74 +423,98 @@ async def test_async_set_dhw_mode_invalid_args(
         assert excinfo.value.translation_key == "invalid_mode_args"
 
 
-async def test_error_handling_coverage_gap(
-    water_heater: RamsesWaterHeater, mock_device: MagicMock
-) -> None:
-    """Test error handling paths that raise HomeAssistantError."""
-
-    # 1. Test ProtocolSendFailed raising HomeAssistantError
-
-    # set_dhw_mode (async_set_dhw_mode)
-    mock_device.set_mode.side_effect = ProtocolSendFailed("RF transmission failed")
-    # FIX: ZoneMode.TEMPORARY requires active=True to pass schema validation
-    with pytest.raises(HomeAssistantError) as excinfo:
-        await water_heater.async_set_dhw_mode(mode=ZoneMode.TEMPORARY, active=True)
-    assert "Failed to set DHW mode" in str(excinfo.value)
-
-    # reset_mode (async_reset_dhw_mode)
-    mock_device.reset_mode.side_effect = ProtocolSendFailed("RF transmission failed")
-    with pytest.raises(HomeAssistantError) as excinfo:
-        await water_heater.async_reset_dhw_mode()
-    assert "Failed to reset DHW mode" in str(excinfo.value)
+# (entity method, its kwargs, device method, expected error message)
+_SEND_FAILED_CASES: Final = (
+    # ZoneMode.TEMPORARY requires active=True to pass schema validation
+    (
+        "async_set_dhw_mode",
+        {"mode": ZoneMode.TEMPORARY, "active": True},
+        "set_mode",
+        "Failed to set DHW mode",
+    ),
+    ("async_reset_dhw_mode", {}, "reset_mode", "Failed to reset DHW mode"),
+    ("async_reset_dhw_params", {}, "reset_config", "Failed to reset DHW params"),
+    ("async_set_dhw_boost", {}, "set_boost_mode", "Failed to set DHW boost"),
+    (
+        "async_set_dhw_params",
+        {"setpoint": 50},
+        "set_config",
+        "Failed to set DHW params",
+    ),
+    (
+        "async_set_dhw_schedule",
+        {"schedule": '{"mon":[]}'},
+        "set_schedule",
+        "Failed to set DHW schedule",
+    ),
+)
 
-    # reset_config (async_reset_dhw_params)
-    mock_device.reset_config.side_effect = ProtocolSendFailed("RF transmission failed")
-    with pytest.raises(HomeAssistantError) as excinfo:
-        await water_heater.async_reset_dhw_params()
-    assert "Failed to reset DHW params" in str(excinfo.value)
 
-    # set_boost (async_set_dhw_boost)
-    mock_device.set_boost_mode.side_effect = ProtocolSendFailed(
+@pytest.mark.parametrize(("method", "kwargs", "attr", "message"), _SEND_FAILED_CASES)
+async def test_error_handling_send_failed(
+    water_heater: RamsesWaterHeater,
+    mock_device: SimpleNamespace,
+    method: str,
+    kwargs: dict[str, Any],
+    attr: str,
+    message: str,
+) -> None:
+    """Test that ProtocolSendFailed is raised as a HomeAssistantError."""
+    getattr(mock_device, attr).side_effect = ProtocolSendFailed(
         "RF transmission failed"
     )
     with pytest.raises(HomeAssistantError) as excinfo:
-        await water_heater.async_set_dhw_boost()
-    assert "Failed to set DHW boost" in str(excinfo.value)
-
-    # set_config (async_set_dhw_params) - ProtocolSendFailed path
-    mock_device.set_config.side_effect = ProtocolSendFailed("RF transmission failed")
-    with pytest.raises(HomeAssistantError) as excinfo:
-        await water_heater.async_set_dhw_params(setpoint=50)
-    assert "Failed to set DHW params" in str(excinfo.value)
-
-    # set_schedule (async_set_dhw_schedule) - ProtocolSendFailed path
-    mock_device.set_schedule.side_effect = ProtocolSendFailed("RF transmission failed")
-    with pytest.raises(HomeAssistantError) as excinfo:
-        await water_heater.async_set_dhw_schedule('{"mon":[]}')
-    assert "Failed to set DHW schedule" in str(excinfo.value)
-
-    # 2. Test ServiceValidationError mapping for methods not covered in test_backend_error_handling
-
-    # reset_config raising ValueError (async_reset_dhw_params)
-    mock_device.reset_config.side_effect = ValueError("Invalid config")
-    with pytest.raises(ServiceValidationError) as excinfo:
-        await water_heater.async_reset_dhw_params()
-    assert excinfo.value.translation_key == "error_reset_config"
+        await getattr(water_heater, method)(**kwargs)
+    assert message in str(excinfo.value)
+
+
+# (entity method, its kwargs, device method, device error, translation key)
+# NOTE: covers the methods not already in test_backend_error_handling
+_VALIDATION_ERROR_CASES: Final = (
+    (
+        "async_reset_dhw_params",
+        {},
+        "reset_config",
+        ValueError("Invalid config"),
+        "error_reset_config",
+    ),
+    (
+        "async_set_dhw_boost",
+        {},
+        "set_boost_mode",
+        TypeError("Invalid argument"),
+        "error_set_boost",
+    ),
+    (
+        "async_set_dhw_params",
+        {"setpoint": 100},
+        "set_config",
+        ValueError("Value out of range"),
+        "error_set_config",
+    ),
+)
 
-    # set_boost raising TypeError (async_set_dhw_boost)
-    mock_device.set_boost_mode.side_effect = TypeError("Invalid argument")
-    with pytest.raises(ServiceValidationError) as excinfo:
-        await water_heater.async_set_dhw_boost()
-    assert excinfo.value.translation_key == "error_set_boost"
 
-    # set_dhw_params raising ValueError (async_set_dhw_params)
-    mock_device.set_config.side_effect = ValueError("Value out of range")
+@pytest.mark.parametrize(
+    ("method", "kwargs", "attr", "error", "translation_key"), _VALIDATION_ERROR_CASES
+)
+async def test_error_handling_validation_error(
+    water_heater: RamsesWaterHeater,
+    mock_device: SimpleNamespace,
+    method: str,
+    kwargs: dict[str, Any],
+    attr: str,
+    error: Exception,
+    translation_key: str,
+) -> None:
+    """Test that bad arguments are raised as a ServiceValidationError."""
+    getattr(mock_device, attr).side_effect = error
     with pytest.raises(ServiceValidationError) as excinfo:
-        await water_heater.async_set_dhw_params(setpoint=100)
-    assert excinfo.value.translation_key == "error_set_config"
+        await getattr(water_heater, method)(**kwargs)
+    assert excinfo.value.translation_key == translation_key
 
 
-async def test_dhw_immediate_update_on_commands(mock_device: MagicMock) -> None:
+async def test_dhw_immediate_update_on_commands(mock_device: SimpleNamespace) -> None:
     """Test that the water heater writes HA state immediately after successful commands."""
 
     # Setup Mocks
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """RAMSES RF - a RAMSES-II protocol decoder & analyser."""
 
+from functools import cache
 from typing import Any, cast
 
 from ramses_rf import Device
@@ -8,16 +9,27 @@ from ramses_rf.binding_fsm import BindingManager
 from ramses_rf.devices import Fakeable
 
 
-def ensure_fakeable(dev: Device, make_fake: bool = True) -> None:
-    """If a Device is not Fakeable (i.e. Fakeable, not _faked), make it so."""
+@cache
+def _fakeable_class(dev_cls: type, fakeable: type) -> type:
+    """Return the (cached) subclass of a device class that mixes in Fakeable.
 
-    class _Fakeable(dev.__class__, Fakeable):
+    Devices of the same class share the one subclass, rather than each
+    building a fresh class object.
+    """
+
+    class _Fakeable(dev_cls, fakeable):
         pass
 
+    return _Fakeable
+
+
+def ensure_fakeable(dev: Device, make_fake: bool = True) -> None:
+    """If a Device is not Fakeable (i.e. Fakeable, not _faked), make it so."""
+
     if isinstance(dev, Fakeable):
         return
 
-    dev.__class__ = _Fakeable
+    dev.__class__ = _fakeable_class(dev.__class__, Fakeable)
     assert isinstance(dev, Fakeable)
 
     # Initialize the new BindingManager.
@@ -94,7 +94,7 @@ class VirtualRfBase:
             self._create_port(idx)
 
         self._log: deque[tuple[_PN, str, bytes]] = deque([], log_size)
-        self._replies: dict[str, bytes] = {}
+        self._replies: dict[re.Pattern[str], bytes] = {}  # compiled once, when added
         self._running = False
 
     def _create_port(self, port_idx: int, dev_type: HgiFwTypes | None = None) -> None:
@@ -135,7 +135,8 @@ class VirtualRfBase:
 
     async def stop(self) -> None:
         """Stop polling ports and distributing data."""
-        if not self._running:
+        if not self._running:  # no readers to remove, but still free the ptys
+            self._cleanup()
             return
 
         # 1. Remove readers first to stop new events from being queued
@@ -248,12 +249,15 @@ class VirtualRfBase:
           cmd regex: r"RQ.* 18:.* 01:.* 0006 001 00"
           reply pkt: "RP --- 01:145038 18:013393 --:------ 0006 004 00050135",
         """
-        self._replies[cmd] = reply.encode() + b"\r\n"
+        self._replies[re.compile(cmd)] = reply.encode() + b"\r\n"
 
     def _find_reply_for_cmd(self, cmd: bytes) -> bytes | None:
         """Return a reply packet for a given command frame (for a mocked device)."""
+        if not self._replies:
+            return None
+        frame = cmd.decode()
         for pattern, reply in self._replies.items():
-            if re.match(pattern, cmd.decode()):
+            if pattern.match(frame):
                 return reply
         return None
 